@@ -2,8 +2,12 @@
 import streamlit as st
 import gspread
 import pandas as pd
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import Credentials
-from gspread.exceptions import SpreadsheetNotFound
+from gspread.exceptions import GSpreadException, SpreadsheetNotFound
+from gspread.utils import DateTimeOption, ValueRenderOption
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # --- Configurações da Planilha ---
 # Cole aqui o ID da sua planilha e o nome da aba
@@ -24,7 +28,18 @@ def get_gspread_client():
             'https://www.googleapis.com/auth/drive.readonly'
         ]
         creds = Credentials.from_service_account_info(credentials_dict, scopes=SCOPES)
-        client = gspread.authorize(creds)
+        # Sessão HTTP com política de retry: repete automaticamente respostas
+        # 429/5xx com backoff, respeitando o cabeçalho Retry-After.
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        session = AuthorizedSession(creds)
+        session.mount('https://', HTTPAdapter(max_retries=retry))
+        client = gspread.Client(creds, session=session)
         return client
     except KeyError:
         st.error("Credenciais do Google não encontradas. Verifique o arquivo secrets.toml.")
@@ -33,6 +48,16 @@ def get_gspread_client():
         st.error(f"Erro de autenticação com Google: {e}")
         return None
 
+@st.cache_resource(ttl=600)
+def get_worksheet(_client):
+    """
+    Abre a planilha e a aba uma única vez e reaproveita o objeto entre
+    execuções, evitando buscar os metadados da planilha a cada leitura.
+    Erros não são cacheados: são tratados por quem chama.
+    """
+    spreadsheet = _client.open_by_key(SPREADSHEET_ID)
+    return spreadsheet.worksheet(WORKSHEET_NAME)
+
 @st.cache_data(ttl=600)
 def read_data_from_gsheet():
     """
@@ -43,12 +68,24 @@ def read_data_from_gsheet():
         return pd.DataFrame()
     
     try:
-        spreadsheet = client.open_by_key(SPREADSHEET_ID)
-        worksheet = spreadsheet.worksheet(WORKSHEET_NAME)
-        # Usamos get_all_records() porque ele retorna uma lista de dicionários,
-        # facilitando a criação do DataFrame.
-        data = worksheet.get_all_records()
-        df = pd.DataFrame(data)
+        worksheet = get_worksheet(client)
+        # Lemos os valores brutos (lista de linhas) em vez de get_all_records(),
+        # que monta um dicionário por linha. Com UNFORMATTED_VALUE os números
+        # já chegam como números; as datas continuam como texto formatado.
+        rows = worksheet.get_values(
+            value_render_option=ValueRenderOption.unformatted,
+            date_time_render_option=DateTimeOption.formatted_string,
+        )
+        # Aba vazia: o gspread devolve [[]].
+        if rows == [[]]:
+            return pd.DataFrame()
+        # Mesma validação que o get_all_records() fazia: cabeçalhos repetidos
+        # (ou colunas de dados sem cabeçalho, preenchidas com '') quebrariam
+        # o st.dataframe mais adiante.
+        header = rows[0]
+        if len(set(header)) != len(header):
+            raise GSpreadException("the header row in the worksheet is not unique")
+        df = pd.DataFrame(rows[1:], columns=header)
         return df
     except SpreadsheetNotFound:
         st.error(f"A planilha com o ID '{SPREADSHEET_ID}' não foi encontrada.")